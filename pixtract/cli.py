@@ -3,27 +3,58 @@
 import argparse
 import os
 import sys
+from typing import Callable, Optional, Tuple
 from . import config
 
+# os.cpu_count() can return None; read it once for both the --workers default and its help text
+_CPU_COUNT = os.cpu_count() or 1
+
 class CustomArgumentParser(argparse.ArgumentParser):
     def error(self, message):
         self.print_help(sys.stderr)
-        self.stderr.write(f'\nerror: {message}\n')
+        sys.stderr.write(f'\nerror: {message}\n')
         sys.exit(2)
 
 def positive_int(value: str) -> int:
     """Type function for argparse to ensure a positive integer."""
     ivalue = int(value)
     if ivalue < 1:
-        raise argparse.ArgumentTypeError("{value} is an invalid positive int value. Must be >= 1.")
+        raise argparse.ArgumentTypeError(f"{value} is an invalid positive int value. Must be >= 1.")
+    return ivalue
+
+def non_negative_int(value: str) -> int:
+    """Type function for argparse to ensure a non-negative integer."""
+    ivalue = int(value)
+    if ivalue < 0:
+        raise argparse.ArgumentTypeError(f"{value} is an invalid non-negative int value. Must be >= 0.")
     return ivalue
 
-def parse_args() -> tuple[argparse.Namespace, argparse.ArgumentParser]:
+def bounded_float(minimum: float, maximum: float) -> Callable[[str], float]:
+    """Builds a type function for argparse that ensures a float within [minimum, maximum]."""
+    def _bounded_float(value: str) -> float:
+        fvalue = float(value)
+        if not minimum <= fvalue <= maximum:
+            raise argparse.ArgumentTypeError(f"{value} is out of range. Must be between {minimum} and {maximum}.")
+        return fvalue
+    return _bounded_float
+
+def bounded_int(minimum: int, maximum: int) -> Callable[[str], int]:
+    """Builds a type function for argparse that ensures an integer within [minimum, maximum]."""
+    def _bounded_int(value: str) -> int:
+        ivalue = int(value)
+        if not minimum <= ivalue <= maximum:
+            raise argparse.ArgumentTypeError(f"{value} is out of range. Must be between {minimum} and {maximum}.")
+        return ivalue
+    return _bounded_int
+
+_PARSER: Optional[argparse.ArgumentParser] = None
+
+def build_parser() -> argparse.ArgumentParser:
     """
-    Parses command-line arguments.
+    Builds the command-line argument parser.
 
     Returns:
-        tuple[argparse.Namespace, argparse.ArgumentParser]: A tuple containing the parsed arguments and the parser object.
+        argparse.ArgumentParser: The configured parser.
     """
     parser = CustomArgumentParser(
         description="""Pixtract: A command-line tool to extract high-quality, non-blurry, and non-duplicate frames from videos.
@@ -49,6 +80,20 @@ If not specified:
   - For a single video input: Frames are saved in a new folder next to the video (e.g., 'video_frames').
   - For a directory input: Frames are saved in a 'Processed_Frames' folder within the input directory."""
     )
+    io_group.add_argument(
+        "-f", "--format",
+        choices=config.OUTPUT_FORMATS,
+        default=config.DEFAULT_OUTPUT_FORMAT,
+        help=f"""Image format for saved frames. Default is {config.DEFAULT_OUTPUT_FORMAT}.
+  - jpg: Compressed JPEG files.
+  - ppm: Uncompressed files; much faster to write, but far larger on disk."""
+    )
+    io_group.add_argument(
+        "-q", "--quality",
+        type=bounded_int(0, 100),
+        default=config.DEFAULT_JPEG_QUALITY,
+        help=f"JPEG quality (0-100) for saved frames. Lower values encode faster and give smaller files. Default is {config.DEFAULT_JPEG_QUALITY}."
+    )
 
     # Processing Parameters
     processing_group = parser.add_argument_group("Processing Parameters")
@@ -60,7 +105,7 @@ If not specified:
     )
     processing_group.add_argument(
         "-s", "--sharpness",
-        type=int,
+        type=non_negative_int,
         default=config.DEFAULT_SHARPNESS_THRESHOLD,
         help=f"""Set the sharpness threshold for blur detection.
 Frames with sharpness values below this threshold will be considered blurry and discarded.
@@ -68,13 +113,21 @@ Lower values are more permissive (allow more blur). Default is {config.DEFAULT_S
     )
     processing_group.add_argument(
         "-d", "--duplicate",
-        type=float,
+        type=bounded_float(0.0, 1.0),
         dest="duplicate_threshold",
         metavar='THRESHOLD',
         default=config.DEFAULT_DUPLICATE_THRESHOLD,
         help=f"""Set the threshold for duplicate detection.
 Higher values (closer to 1.0) are more strict, meaning frames must be nearly identical to be considered duplicates.
 Lower values (closer to 0.0) are more permissive (allow more differences). Default is {config.DEFAULT_DUPLICATE_THRESHOLD}."""
+    )
+    processing_group.add_argument(
+        "-m", "--duplicate-method",
+        choices=config.DUPLICATE_METHODS,
+        default=config.DEFAULT_DUPLICATE_METHOD,
+        help=f"""How duplicate frames are detected. Default is {config.DEFAULT_DUPLICATE_METHOD}.
+  - ssim: Frames are compared with SSIM, most similar perceptual hashes first (accurate).
+  - hash: The perceptual hash distance alone decides (much faster, slightly less precise)."""
     )
     processing_group.add_argument(
         "-r", "--rotate",
@@ -83,6 +136,11 @@ Lower values (closer to 0.0) are more permissive (allow more differences). Defau
         default=config.DEFAULT_ROTATION_ANGLE,
         help=f"Rotate extracted frames by 0, 90, 180, or 270 degrees. Default is {config.DEFAULT_ROTATION_ANGLE} (no rotation)."
     )
+    processing_group.add_argument(
+        "--exif-rotation",
+        action="store_true",
+        help="Store the --rotate angle as EXIF orientation instead of rotating the pixels. Faster, but only EXIF-aware viewers will show the frames rotated."
+    )
 
     # General Options
     general_group = parser.add_argument_group("General Options")
@@ -98,15 +156,27 @@ Lower values (closer to 0.0) are more permissive (allow more differences). Defau
     )
     general_group.add_argument(
         "-l", "--limit",
-        type=int,
+        type=positive_int,
         default=None,
         help="Limit the number of videos to process when an input directory is provided."
     )
     general_group.add_argument(
         "-w", "--workers",
         type=positive_int,
-        default=os.cpu_count(),
-        help=f"Number of parallel processes to use for video processing. Default is {os.cpu_count()} (number of CPU cores)."
+        default=_CPU_COUNT,
+        help=f"Number of parallel processes to use for video processing. Default is {_CPU_COUNT} (number of CPU cores)."
     )
 
-    return parser.parse_args(), parser
+    return parser
+
+def parse_args() -> Tuple[argparse.Namespace, argparse.ArgumentParser]:
+    """
+    Parses command-line arguments, building the parser only on first use.
+
+    Returns:
+        tuple[argparse.Namespace, argparse.ArgumentParser]: A tuple containing the parsed arguments and the parser object.
+    """
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = build_parser()
+    return _PARSER.parse_args(), _PARSER
@@ -8,6 +8,37 @@ DEFAULT_INTERVAL = 1
 DEFAULT_SHARPNESS_THRESHOLD = 100
 DEFAULT_DUPLICATE_THRESHOLD = 1.0
 DEFAULT_ROTATION_ANGLE = 0
+DEFAULT_DUPLICATE_METHOD = "ssim"
+DEFAULT_OUTPUT_FORMAT = "jpg"
+DEFAULT_JPEG_QUALITY = 95
+
+# "jpg": compressed output. "ppm": uncompressed, far cheaper to write but much larger on disk.
+OUTPUT_FORMATS = ("jpg", "ppm")
+# "ssim": SSIM decides, with the dHash distance only ordering the comparisons. "hash": the dHash distance alone decides.
+DUPLICATE_METHODS = ("ssim", "hash")
+# Side of the square grayscale thumbnail that SSIM compares; plenty to tell duplicates apart
+SSIM_THUMBNAIL_SIZE = 64
+# Frames whose 32-bin grayscale histograms imply an average brightness shift above this many gray levels skip SSIM as non-duplicates
+# SSIM tolerates brightness changes well, so the allowance grows by HISTOGRAM_SHIFT_SLACK levels per unit below a threshold of 1.0
+HISTOGRAM_BINS = 32
+MAX_HISTOGRAM_SHIFT = 24.0
+HISTOGRAM_SHIFT_SLACK = 510.0
+# EXIF orientation tag values that make viewers display a frame rotated clockwise by the given angle
+EXIF_ORIENTATIONS = {90: 6, 180: 3, 270: 8}
+# How many of the most recently kept frames each new frame is checked against for duplicates
+DUPLICATE_LOOKBACK_FRAMES = 16
+
+# Ask FFmpeg for hardware video decoding (NVDEC, QSV, VAAPI, ...) when available; it falls back to software otherwise
+USE_HARDWARE_DECODING = True
+# From this frame interval on, seek straight to each sampled frame instead of decoding the ones in between.
+# A seek decodes forward from the previous keyframe, so it only pays off once the interval spans a typical GOP.
+SEEK_MIN_FRAME_INTERVAL = 120
+
+# Most threads that analyse one video's frames; each keeps two decoded frames in flight, and analysis is cheap next to decoding
+MAX_ANALYSIS_THREADS = 4
+# Threads that JPEG-encode and write kept frames while decoding continues, and how many frames may queue for them
+FRAME_WRITER_THREADS = 2
+MAX_PENDING_FRAME_WRITES = 8
 
 LOG_FORMAT_VERBOSE = '%(asctime)s - %(levelname)s - %(message)s'
 LOG_FORMAT_SIMPLE = '%(message)s'
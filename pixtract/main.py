@@ -1,205 +1,418 @@
 """Main entry point for the video processing application."""
 
+import functools
 import os
+import stat
 import sys
 import logging
-from tqdm import tqdm
-from colorama import Fore, Style, init
-from typing import List, Any, Optional, Dict
+import traceback
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import argparse
 
-from .cli import parse_args
-from .processing import process_video_frames
+from .cli import build_parser, parse_args
 from . import config
 
-init(autoreset=True)
+logger = logging.getLogger(__name__)
+
+# Heavy dependencies (OpenCV, NumPy, tqdm, colorama) are imported inside the
+# functions that need them, so `--help` and invalid invocations fail fast.
 
 def _configure_logging(verbose: bool) -> None:
     """Configures the logging for the application."""
+    from colorama import Fore, init
+    init(autoreset=True)
+
     log_level: int = logging.DEBUG if verbose else logging.INFO
     log_format: str = config.LOG_FORMAT_VERBOSE if verbose else config.LOG_FORMAT_SIMPLE
     logging.basicConfig(level=log_level, format=log_format)
 
     if verbose:
-        logging.debug(f"{Fore.CYAN}--- Verbose Mode Enabled ---")
+        logger.debug("%s--- Verbose Mode Enabled ---", Fore.CYAN)
 
-def _validate_input_path(input_path: str) -> None:
-    """Validates the existence and type of the input path."""
-    if not os.path.exists(input_path):
-        logging.error(f"Error: Input path '{input_path}' does not exist.")
-        sys.exit(1)
-    
-    if not os.path.isfile(input_path) and not os.path.isdir(input_path):
-        logging.error(f"Error: Input path '{input_path}' is neither a file nor a directory.")
-        sys.exit(1)
+def _find_output_error(output_directory: str) -> Optional[str]:
+    """Returns an error message if the output directory cannot be written to, otherwise None."""
+    # Walk up to the closest existing ancestor, which is where the directory will be created.
+    existing_path = os.path.abspath(output_directory)
+    while not os.path.exists(existing_path):
+        parent = os.path.dirname(existing_path)
+        if parent == existing_path:
+            break
+        existing_path = parent
+
+    if not os.path.isdir(existing_path):
+        return f"Output path '{existing_path}' is not a directory."
+    if not os.access(existing_path, os.W_OK):
+        return f"Output directory '{existing_path}' is not writable."
+    return None
+
+def _validate_all(args: argparse.Namespace) -> Tuple[bool, List[str]]:
+    """
+    Validates the input and output paths before any files are created or workers are started.
+
+    Numeric arguments are already range-checked by argparse, so this only covers the filesystem.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line arguments.
 
-def _determine_output_directory(input_path: str, output_directory_arg: Optional[str]) -> str:
+    Returns:
+        tuple[bool, list[str]]: Whether the input path is a directory, and every validation error found.
+    """
+    errors: List[str] = []
+    input_is_dir = False
+    input_is_valid = False
+    try:
+        input_stat = os.stat(args.input_path)
+    except OSError:
+        errors.append(f"Input path '{args.input_path}' does not exist.")
+    else:
+        input_is_dir = stat.S_ISDIR(input_stat.st_mode)
+        input_is_valid = input_is_dir or stat.S_ISREG(input_stat.st_mode)
+        if not input_is_valid:
+            errors.append(f"Input path '{args.input_path}' is neither a file nor a directory.")
+
+    # The default output location is derived from the input, so it can only be checked for a valid input.
+    if not args.dry_run and (input_is_valid or args.output is not None):
+        output_error = _find_output_error(_determine_output_directory(args.input_path, input_is_dir, args.output))
+        if output_error:
+            errors.append(output_error)
+
+    return input_is_dir, errors
+
+def _video_stem(video_file: str) -> str:
+    """Returns a video's filename without its directory or extension, used to name its output folder."""
+    return os.path.splitext(os.path.basename(video_file))[0]
+
+def _determine_output_directory(input_path: str, input_is_dir: bool, output_directory_arg: Optional[str]) -> str:
     """Determines the output directory based on input path and provided argument."""
     if output_directory_arg is None:
-        if os.path.isfile(input_path):
+        if not input_is_dir:
             output_directory_base = os.path.dirname(input_path)
-            video_filename_no_ext = os.path.splitext(os.path.basename(input_path))[0]
+            video_filename_no_ext = _video_stem(input_path)
             return os.path.join(output_directory_base, f"{video_filename_no_ext}{config.DEFAULT_SINGLE_VIDEO_OUTPUT_SUFFIX}")
         else: # is a directory
             return os.path.join(input_path, config.DEFAULT_DIRECTORY_OUTPUT_FOLDER)
     return output_directory_arg
 
 def _prepare_output_directory(output_directory: str, dry_run: bool) -> None:
-    """Checks if the output directory is writable and creates it if it doesn't exist."""
+    """Creates the output directory if it doesn't exist. Writability is checked by `_validate_all`."""
     if dry_run:
         return
 
-    if os.path.exists(output_directory) and not os.access(output_directory, os.W_OK):
-        logging.error(f"Error: Output directory '{output_directory}' is not writable.")
+    try:
+        os.makedirs(output_directory, exist_ok=True)
+        logger.debug("Output directory ready: %s", output_directory)
+    except OSError as e:
+        logger.error("Error creating output directory '%s': %s", output_directory, e, exc_info=True)
         sys.exit(1)
-    elif not os.path.exists(output_directory):
-        try:
-            os.makedirs(output_directory)
-            logging.debug(f"Created output directory: {output_directory}")
-        except OSError as e:
-            logging.error(f"Error creating output directory '{output_directory}': {e}", exc_info=True)
-            sys.exit(1)
 
-import concurrent.futures
-
-def _get_video_files(input_path: str, limit: Optional[int]) -> List[str]:
-    """Discovers video files based on the input path and applies the limit."""
-    if os.path.isfile(input_path):
-        video_files: List[str] = [input_path]
+def _get_video_files(input_path: str, input_is_dir: bool, limit: Optional[int]) -> List[Tuple[str, int]]:
+    """Discovers video files based on the input path and applies the limit. Returns (path, size in bytes) pairs."""
+    if not input_is_dir:
+        # Sizes only order the work across a directory, so a single video needs no extra stat
+        video_files: List[Tuple[str, int]] = [(input_path, 0)]
     else: # is a directory
-        video_files = [os.path.join(input_path, f) for f in os.listdir(input_path) if f.lower().endswith(config.VIDEO_EXTENSIONS)]
+        # scandir entries carry their file type (and cache their stat), avoiding a stat per listed name
+        with os.scandir(input_path) as entries:
+            video_files = [
+                (entry.path, entry.stat().st_size)
+                for entry in entries
+                if entry.name.lower().endswith(config.VIDEO_EXTENSIONS) and entry.is_file()
+            ]
 
     if limit:
         video_files = video_files[:limit]
     return video_files
 
-def _process_single_video(video_file: str, input_path: str, output_directory: str, processing_params: Dict[str, Any]) -> Dict[str, Any]:
-    """Helper function to process a single video, used by the multiprocessing pool."""
-    if os.path.isdir(input_path):
-        video_specific_output_folder = os.path.join(output_directory, os.path.splitext(os.path.basename(video_file))[0])
-    else:
-        video_specific_output_folder = output_directory
-
-    return process_video_frames(
-        video_file,
-        video_specific_output_folder,
-        sharpness_threshold=processing_params["sharpness_threshold"],
-        duplicate_threshold=processing_params["duplicate_threshold"],
-        rotation_angle=processing_params["rotation_angle"],
-        dry_run=processing_params["dry_run"],
-        frame_interval=processing_params["frame_interval"]
-    )
-
-def _process_videos(video_files: List[str], input_path: str, output_directory: str, processing_params: Dict[str, Any], num_workers: int) -> List[Dict[str, Any]]:
-    """Processes a list of video files in parallel and returns their processing summaries."""
-    processing_summaries: List[Dict[str, Any]] = []
-    
-    # Use ProcessPoolExecutor for parallel processing
-    with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
-        # Submit tasks to the executor
-        future_to_video = {
-            executor.submit(_process_single_video, video_file, input_path, output_directory, processing_params): video_file
-            for video_file in video_files
-        }
+# Processing parameters shared by every task in a pool worker, set once by `_worker_init`
+_WORKER_PARAMS: Dict[str, Any] = {}
+
+def _worker_init(processing_params: Dict[str, Any]) -> None:
+    """Initializer for pool workers that stores the shared parameters, limits threading and preloads the processing modules."""
+    # Sent once per worker, so tasks only carry their own paths
+    _WORKER_PARAMS.update(processing_params)
+
+    # Each worker is one of `--workers` processes, so cap its native thread pools at one thread to
+    # avoid cpu_count² threads competing for cores. The BLAS/OpenMP variables must be set before
+    # NumPy is imported; explicit user settings are left alone.
+    for env_var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ.setdefault(env_var, "1")
+
+    # Pay the OpenCV/NumPy import once per worker, up front, rather than inside the first task
+    import cv2
+    from . import processing  # noqa: F401
+
+    cv2.setNumThreads(1)
+
+def _make_failed_summary(video_file: str, error: str) -> Dict[str, Any]:
+    """Builds the summary reported for a video that could not be processed."""
+    return {
+        "video": video_file,
+        "output_folder": "N/A",
+        "extracted_frames": 0,
+        "blurry_frames_removed": 0,
+        "duplicate_frames_removed": 0,
+        "final_frames_count": 0,
+        "status": "failed",
+        "error": error
+    }
+
+def _process_single_video(video_file: str, output_folder: str, processing_params: Dict[str, Any], num_threads: int = 1) -> Dict[str, Any]:
+    """
+    Processes a single video, either inline or inside a pool worker, analysing its frames on `num_threads` threads.
+
+    Exceptions are turned into a failed summary so one bad video doesn't abort the rest of the batch.
+    """
+    from .processing import process_video_frames
+
+    try:
+        return process_video_frames(
+            video_file,
+            output_folder,
+            sharpness_threshold=processing_params["sharpness_threshold"],
+            duplicate_threshold=processing_params["duplicate_threshold"],
+            rotation_angle=processing_params["rotation_angle"],
+            dry_run=processing_params["dry_run"],
+            frame_interval=processing_params["frame_interval"],
+            duplicate_method=processing_params["duplicate_method"],
+            exif_rotation=processing_params["exif_rotation"],
+            output_format=processing_params["output_format"],
+            jpeg_quality=processing_params["jpeg_quality"],
+            create_output_folder=False, # Already created by the parent process
+            num_threads=num_threads
+        )
+    except Exception as exc:
+        summary = _make_failed_summary(video_file, str(exc))
+        summary["traceback"] = traceback.format_exc()
+        return summary
+
+def _process_video_in_worker(video_file: str, output_folder: str) -> Dict[str, Any]:
+    """Pool task: processes one video with the parameters `_worker_init` stored in this worker."""
+    return _process_single_video(video_file, output_folder, _WORKER_PARAMS)
+
+def _failed_from_exception(video_file: str, exc: Exception) -> Dict[str, Any]:
+    """Builds a failed summary, with traceback, for an exception raised while collecting a pool task's result."""
+    summary = _make_failed_summary(video_file, str(exc) or type(exc).__name__)
+    summary["traceback"] = traceback.format_exc()
+    return summary
 
-        # Use tqdm to show progress as futures complete
-        with tqdm(total=len(video_files), desc="Processing Videos", unit="video", bar_format="{l_bar}{bar:20}{r_bar}") as pbar:
-            for future in concurrent.futures.as_completed(future_to_video):
-                video_file = future_to_video[future]
+def _start_pool(processing_params: Dict[str, Any], jobs: List[Tuple[str, str]], num_workers: int) -> Tuple[Any, Dict[Any, Tuple[str, str]]]:
+    """Starts a worker pool and submits a (video, output folder) job to it for each video, in order."""
+    import concurrent.futures
+
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=num_workers, initializer=_worker_init, initargs=(processing_params,))
+    future_to_job = {executor.submit(_process_video_in_worker, video_file, output_folder): (video_file, output_folder) for video_file, output_folder in jobs}
+    return executor, future_to_job
+
+def _collect_summaries(executor: Any, future_to_job: Dict[Any, Tuple[str, str]], processing_params: Dict[str, Any], num_workers: int) -> Iterator[Dict[str, Any]]:
+    """
+    Yields each submitted video's summary as it completes, shutting every pool down once it is drained.
+
+    If a worker process dies (e.g. killed for memory or crashed in FFmpeg), the executor fails every
+    unfinished future with BrokenProcessPool. Jobs are dispatched in submission order, so only the earliest
+    `num_workers` unfinished videos can have been running: each of those is retried once, alone in a
+    one-worker pool so a repeat crash fails only that video. The rest never started and go to a fresh pool.
+    """
+    import concurrent.futures
+    from concurrent.futures.process import BrokenProcessPool
+
+    submission_order = {job: index for index, job in enumerate(future_to_job.values())}
+    retry_jobs: List[Tuple[str, str]] = []
+    while future_to_job:
+        interrupted_jobs: List[Tuple[str, str]] = []
+        with executor:
+            for future in concurrent.futures.as_completed(future_to_job):
+                job = future_to_job[future]
                 try:
                     summary = future.result()
-                    processing_summaries.append(summary)
+                except BrokenProcessPool:
+                    interrupted_jobs.append(job)
+                    continue
                 except Exception as exc:
-                    logging.error(f'{video_file} generated an exception: {exc}', exc_info=True)
-                    # Append a summary indicating failure for this video
-                    processing_summaries.append({
-                        "video": video_file,
-                        "output_folder": "N/A",
-                        "extracted_frames": 0,
-                        "blurry_frames_removed": 0,
-                        "duplicate_frames_removed": 0,
-                        "final_frames_count": 0,
-                        "status": "failed",
-                        "error": str(exc)
-                    })
-                pbar.update(1)
-    return processing_summaries
-
-def _log_summaries(processing_summaries: List[Dict[str, Any]]) -> None:
-    """Logs the individual and overall processing summaries."""
-    total_frames_extracted: int = 0
-    total_blurry_frames_removed: int = 0
-    total_duplicate_frames_removed: int = 0
-    total_final_frames_count: int = 0
-    total_failed_videos: int = 0
+                    summary = _failed_from_exception(job[0], exc)
+                yield summary
+
+        future_to_job = {}
+        if interrupted_jobs:
+            interrupted_jobs.sort(key=submission_order.__getitem__)
+            logger.warning("A worker process died; retrying the %d video(s) it may have been processing.", min(len(interrupted_jobs), num_workers))
+            retry_jobs.extend(interrupted_jobs[:num_workers])
+            if len(interrupted_jobs) > num_workers:
+                executor, future_to_job = _start_pool(processing_params, interrupted_jobs[num_workers:], num_workers)
+
+    for job in retry_jobs:
+        executor, future_to_job = _start_pool(processing_params, [job], 1)
+        with executor:
+            (future,) = future_to_job
+            try:
+                summary = future.result()
+            except Exception as exc:
+                summary = _failed_from_exception(job[0], exc)
+        yield summary
+
+def _iter_summaries(video_paths: List[str], output_folders: List[str], processing_params: Dict[str, Any], num_workers: int) -> Iterator[Dict[str, Any]]:
+    """
+    Returns an iterator over each video's processing summary, using a process pool only when there is work to parallelize.
+
+    Pool work is submitted before this returns, so the worker processes are started before the caller
+    creates any threads of its own (such as a progress bar's monitor thread).
+    """
+    # A single video (or worker) gains nothing from a pool but its startup and pickling costs.
+    # Processed inline, its frames are analysed on `num_workers` threads instead.
+    if len(video_paths) <= 1 or num_workers == 1:
+        process_video = functools.partial(_process_single_video, processing_params=processing_params, num_threads=num_workers)
+        return map(process_video, video_paths, output_folders)
+
+    # Pool workers receive the shared parameters once, through `_worker_init`; each task only pickles its own paths
+    executor, future_to_job = _start_pool(processing_params, list(zip(video_paths, output_folders)), num_workers)
+    return _collect_summaries(executor, future_to_job, processing_params, num_workers)
+
+def _create_output_folders(video_paths: List[str], output_folders: List[str]) -> Tuple[List[str], List[str], List[Dict[str, Any]]]:
+    """
+    Creates every per-video output folder in one pass before any work is dispatched.
+
+    Returns:
+        tuple[list[str], list[str], list[dict]]: The videos and folders that are ready, and failed summaries for the rest.
+    """
+    ready_videos: List[str] = []
+    ready_folders: List[str] = []
+    failed_summaries: List[Dict[str, Any]] = []
+    for video_file, output_folder in zip(video_paths, output_folders):
+        try:
+            os.makedirs(output_folder, exist_ok=True)
+        except OSError as e:
+            logger.error("Error creating output directory '%s': %s", output_folder, e)
+            failed_summaries.append(_make_failed_summary(video_file, str(e)))
+            continue
+        ready_videos.append(video_file)
+        ready_folders.append(output_folder)
+    return ready_videos, ready_folders, failed_summaries
+
+def _record_summary(summary: Dict[str, Any], totals: Dict[str, int], retained_summaries: List[Dict[str, Any]]) -> None:
+    """Adds a video's summary to the running totals, keeping the summary itself only if it will be logged."""
+    if summary.get("status") == "failed":
+        totals["failed_videos"] += 1
+        retained_summaries.append(summary)
+        return
+
+    totals["extracted_frames"] += summary["extracted_frames"]
+    totals["blurry_frames_removed"] += summary["blurry_frames_removed"]
+    totals["duplicate_frames_removed"] += summary["duplicate_frames_removed"]
+    totals["final_frames_count"] += summary["final_frames_count"]
+
+    # Successful per-video details are only shown in verbose mode
+    if logger.isEnabledFor(logging.DEBUG):
+        retained_summaries.append(summary)
+
+def _process_videos(video_files: List[Tuple[str, int]], input_is_dir: bool, output_directory: str, processing_params: Dict[str, Any], num_workers: int) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+    """
+    Processes a list of video files in parallel, aggregating their results as they complete.
+
+    Returns:
+        tuple[dict, list[dict]]: The overall totals, and the per-video summaries worth logging
+        (failed videos always, successful ones only in verbose mode).
+    """
+    from tqdm import tqdm
+
+    totals: Dict[str, int] = {
+        "extracted_frames": 0,
+        "blurry_frames_removed": 0,
+        "duplicate_frames_removed": 0,
+        "final_frames_count": 0,
+        "failed_videos": 0
+    }
+    retained_summaries: List[Dict[str, Any]] = []
+
+    # Submit the largest videos first so a long video doesn't start last and run alone on one core
+    video_files = sorted(video_files, key=lambda video: video[1], reverse=True)
+    video_paths = [video_file for video_file, _ in video_files]
+
+    # Each video of a directory input gets its own subfolder; resolve them here once rather than per task
+    if input_is_dir:
+        output_folders = [os.path.join(output_directory, _video_stem(video_file)) for video_file in video_paths]
+        if not processing_params["dry_run"]:
+            # Workers would otherwise race each other creating sibling directories
+            video_paths, output_folders, failed_summaries = _create_output_folders(video_paths, output_folders)
+            for summary in failed_summaries:
+                _record_summary(summary, totals, retained_summaries)
+    else:
+        output_folders = [output_directory] * len(video_paths) # Created by _prepare_output_directory
+
+    # Start the pool before the progress bar, whose monitor thread must not exist when workers are forked
+    summaries = _iter_summaries(video_paths, output_folders, processing_params, num_workers)
+
+    # Skip the bar when stderr isn't a terminal (CI logs), and cap redraws when many short videos finish together
+    with tqdm(total=len(video_paths), desc="Processing Videos", unit="video", bar_format="{l_bar}{bar:20}{r_bar}", disable=not sys.stderr.isatty(), mininterval=0.2) as pbar:
+        for summary in summaries:
+            if summary.get("status") == "failed":
+                logger.error("%s generated an exception: %s", summary["video"], summary["error"])
+                logger.debug("%s", summary["traceback"])
+            _record_summary(summary, totals, retained_summaries)
+            pbar.update(1)
+    return totals, retained_summaries
+
+def _log_summaries(totals: Dict[str, int], processing_summaries: List[Dict[str, Any]]) -> None:
+    """Logs the retained per-video summaries and the overall totals."""
+    from colorama import Fore
 
     for summary in processing_summaries:
         if summary.get("status") == "failed":
-            total_failed_videos += 1
-            logging.error(f"\n{Fore.RED}Video: {summary['video']} - FAILED ({summary.get('error', 'Unknown error')})")
+            logger.error("\n%sVideo: %s - FAILED (%s)", Fore.RED, summary["video"], summary.get("error", "Unknown error"))
             continue
 
-        total_frames_extracted += summary["extracted_frames"]
-        total_blurry_frames_removed += summary["blurry_frames_removed"]
-        total_duplicate_frames_removed += summary["duplicate_frames_removed"]
-        total_final_frames_count += summary["final_frames_count"]
-
-        logging.debug(f"\n{Fore.CYAN}Video: {summary['video']}")
-        logging.debug(f"  {Fore.YELLOW}Output Folder: {summary['output_folder']}")
-        logging.debug(f"  {Fore.BLUE}Extracted Frames: {summary['extracted_frames']}")
-        logging.debug(f"  {Fore.RED}Blurry Frames Removed: {summary['blurry_frames_removed']}")
-        logging.debug(f"  {Fore.MAGENTA}Duplicate Frames Removed: {summary['duplicate_frames_removed']}")
-        logging.debug(f"  {Fore.GREEN}Final Frames Count: {summary['final_frames_count']}")
-
-    logging.info(f"\n{Fore.GREEN}--- Overall Summary ---")
-    logging.info(f"{Fore.BLUE}Total Extracted Frames: {total_frames_extracted}")
-    logging.info(f"{Fore.RED}Total Blurry Frames Removed: {total_blurry_frames_removed}")
-    logging.info(f"{Fore.MAGENTA}Total Duplicate Frames Removed: {total_duplicate_frames_removed}")
-    logging.info(f"{Fore.GREEN}Total Final Frames Count: {total_final_frames_count}")
-    if total_failed_videos > 0:
-        logging.info(f"{Fore.RED}Total Videos Failed: {total_failed_videos}")
+        logger.debug("\n%sVideo: %s", Fore.CYAN, summary["video"])
+        logger.debug("  %sOutput Folder: %s", Fore.YELLOW, summary["output_folder"])
+        logger.debug("  %sExtracted Frames: %s", Fore.BLUE, summary["extracted_frames"])
+        logger.debug("  %sBlurry Frames Removed: %s", Fore.RED, summary["blurry_frames_removed"])
+        logger.debug("  %sDuplicate Frames Removed: %s", Fore.MAGENTA, summary["duplicate_frames_removed"])
+        logger.debug("  %sFinal Frames Count: %s", Fore.GREEN, summary["final_frames_count"])
+
+    logger.info("\n%s--- Overall Summary ---", Fore.GREEN)
+    logger.info("%sTotal Extracted Frames: %d", Fore.BLUE, totals["extracted_frames"])
+    logger.info("%sTotal Blurry Frames Removed: %d", Fore.RED, totals["blurry_frames_removed"])
+    logger.info("%sTotal Duplicate Frames Removed: %d", Fore.MAGENTA, totals["duplicate_frames_removed"])
+    logger.info("%sTotal Final Frames Count: %d", Fore.GREEN, totals["final_frames_count"])
+    if totals["failed_videos"] > 0:
+        logger.info("%sTotal Videos Failed: %d", Fore.RED, totals["failed_videos"])
 
 def main() -> None:
     """Main function to process all specified videos."""
     try:
-        args, parser = parse_args()
-
-        # If no arguments were provided, print help and exit
+        # If no arguments were provided, print help and exit without parsing anything
         if len(sys.argv) == 1:
-            parser.print_help()
+            build_parser().print_help()
             sys.exit(0)
 
+        args, _ = parse_args()
+
         _configure_logging(args.verbose)
 
-        input_path: str = args.input_path
-        output_directory: Optional[str] = args.output
-        sharpness_threshold: int = args.sharpness
-        duplicate_threshold: float = args.duplicate_threshold
-        rotation_angle: int = args.rotate
-        dry_run: bool = args.dry_run
-        limit: Optional[int] = args.limit
-        frame_interval: int = args.interval
-        num_workers: int = args.workers # New argument
+        input_is_dir, errors = _validate_all(args)
+        if errors:
+            for error in errors:
+                logger.error("Error: %s", error)
+            sys.exit(1)
 
-        _validate_input_path(input_path)
+        output_directory = _determine_output_directory(args.input_path, input_is_dir, args.output)
 
-        output_directory = _determine_output_directory(input_path, output_directory)
-        
-        video_files = _get_video_files(input_path, limit)
-        _prepare_output_directory(output_directory, dry_run)
+        video_files = _get_video_files(args.input_path, input_is_dir, args.limit)
+        _prepare_output_directory(output_directory, args.dry_run)
 
         processing_params = {
-            "sharpness_threshold": sharpness_threshold,
-            "duplicate_threshold": duplicate_threshold,
-            "rotation_angle": rotation_angle,
-            "dry_run": dry_run,
-            "frame_interval": frame_interval
+            "sharpness_threshold": args.sharpness,
+            "duplicate_threshold": args.duplicate_threshold,
+            "rotation_angle": args.rotate,
+            "dry_run": args.dry_run,
+            "frame_interval": args.interval,
+            "duplicate_method": args.duplicate_method,
+            "exif_rotation": args.exif_rotation,
+            "output_format": args.format,
+            "jpeg_quality": args.quality
         }
-        processing_summaries = _process_videos(video_files, input_path, output_directory, processing_params, num_workers) # Pass num_workers
-        _log_summaries(processing_summaries)
+        totals, processing_summaries = _process_videos(video_files, input_is_dir, output_directory, processing_params, args.workers)
+        _log_summaries(totals, processing_summaries)
 
     except KeyboardInterrupt:
-        logging.info("\n\nProcessing interrupted by user. Exiting gracefully.")
+        logger.info("\n\nProcessing interrupted by user. Exiting gracefully.")
         sys.exit(0)
     except SystemExit as e:
         if e.code != 0:
@@ -207,7 +420,7 @@ def main() -> None:
             pass
         sys.exit(e.code)
     except Exception as e:
-        logging.error(f"An unhandled error occurred: {e}", exc_info=True)
+        logger.error("An unhandled error occurred: %s", e, exc_info=True)
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -1,191 +1,352 @@
 """Core functions for video frame extraction, sharpness analysis, and duplicate detection."""
 import os
+import sys
+import struct
 import cv2
 import logging
-from typing import Dict, Any
+import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
 from tqdm import tqdm
-from .utils import calculate_sharpness, are_images_duplicates
+from . import config
+from .utils import calculate_sharpness_from_array, are_arrays_duplicates, compute_dhash_from_array, compute_histogram_from_array, compute_ssim_thumbnail, hamming_distances
 
-def extract_frames(video_path: str, output_folder: str, frame_interval: int = 1, rotation_angle: int = 0, dry_run: bool = False) -> int:
+_ROTATE_CODES = {
+    90: cv2.ROTATE_90_CLOCKWISE,
+    180: cv2.ROTATE_180,
+    270: cv2.ROTATE_90_COUNTERCLOCKWISE,
+}
+
+def _max_hash_distance(duplicate_threshold: float) -> int:
+    """
+    Returns the largest dHash Hamming distance at which the "hash" method calls two frames duplicates.
+
+    The fraction of differing bits allowed is 1 - duplicate_threshold.
+    """
+    return round((1.0 - duplicate_threshold) * 64)
+
+def _create_output_folder(output_folder: str) -> bool:
+    """Creates the output folder if needed. Returns False (after logging) if it could not be created."""
+    try:
+        os.makedirs(output_folder, exist_ok=True)
+        return True
+    except OSError as e:
+        logging.error("Error creating output directory %s: %s", output_folder, e, exc_info=True)
+        return False
+
+def _exif_orientation_segment(rotation_angle: int) -> bytes:
+    """Builds a JPEG APP1 segment holding a minimal EXIF block with just the orientation tag for `rotation_angle`."""
+    orientation = config.EXIF_ORIENTATIONS[rotation_angle]
+    # Big-endian TIFF header, then one IFD with a single SHORT entry (tag 0x0112) and no next IFD
+    tiff = b"MM\x00\x2a" + struct.pack(">I", 8) + struct.pack(">HHHIHHI", 1, 0x0112, 3, 1, orientation, 0, 0)
+    payload = b"Exif\x00\x00" + tiff
+    return b"\xff\xe1" + struct.pack(">H", len(payload) + 2) + payload
+
+def _write_frame(frame_filename: str, frame: np.ndarray, exif_segment: Optional[bytes] = None, write_params: Sequence[int] = ()) -> bool:
+    """
+    Writes a frame to disk as an image. Returns True if it was written.
+
+    If `exif_segment` is given, the frame is JPEG-encoded in memory and the segment is spliced in after the
+    JFIF header, so viewers apply the orientation without the pixels ever being rotated.
+    """
+    try:
+        if exif_segment is None:
+            if cv2.imwrite(frame_filename, frame, list(write_params)):
+                return True
+            logging.warning("cv2.imwrite reported failure for frame: %s", frame_filename)
+            return False
+
+        ok, encoded = cv2.imencode(".jpg", frame, list(write_params))
+        if not ok:
+            logging.warning("cv2.imencode reported failure for frame: %s", frame_filename)
+            return False
+        data = encoded.tobytes()
+        # Keep the SOI marker and, if present, the JFIF APP0 segment ahead of the EXIF segment
+        insert_at = 2
+        if data[2:4] == b"\xff\xe0":
+            insert_at += 2 + struct.unpack(">H", data[4:6])[0]
+        with open(frame_filename, "wb") as f:
+            f.write(data[:insert_at])
+            f.write(exif_segment)
+            f.write(data[insert_at:])
+        return True
+    except Exception as e:
+        logging.error("Exception while writing frame %s: %s", frame_filename, e, exc_info=True)
+    return False
+
+def _drain_writes(pending_writes: deque, max_pending: int) -> int:
+    """Waits for the oldest queued frame writes until at most `max_pending` remain. Returns how many succeeded."""
+    written = 0
+    while len(pending_writes) > max_pending:
+        written += pending_writes.popleft().result()
+    return written
+
+def _open_capture(video_path: str) -> cv2.VideoCapture:
+    """
+    Opens a video, preferring FFmpeg with hardware-accelerated decoding.
+
+    Falls back to OpenCV's default backend if the FFmpeg backend cannot open the file.
+    """
+    if config.USE_HARDWARE_DECODING and hasattr(cv2, "VIDEO_ACCELERATION_ANY"):
+        cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG, [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+        if cap.isOpened():
+            return cap
+        cap.release()
+    return cv2.VideoCapture(video_path)
+
+def iter_frames(video_path: str, frame_interval: int = 1, rotation_angle: int = 0) -> Iterator[Tuple[int, np.ndarray]]:
     """
-    Extracts frames from a video file and saves them as images.
+    Decodes a video and yields every `frame_interval`-th frame, rotated as requested.
 
     Args:
         video_path (str): The path to the video file.
-        output_folder (str): The path to the output directory.
         frame_interval (int, optional): The interval at which to extract frames. Defaults to 1 (every frame).
         rotation_angle (int, optional): The angle to rotate the frames. Defaults to 0.
-        dry_run (bool, optional): If True, simulates the process without saving files. Defaults to False.
 
-    Returns:
-        int: The number of frames that were actually saved.
+    Yields:
+        tuple[int, np.ndarray]: The frame's index in the video and the decoded BGR frame.
     """
-    if not dry_run:
-        try:
-            os.makedirs(output_folder, exist_ok=True)
-        except OSError as e:
-            logging.error(f"Error creating output directory {output_folder}: {e}", exc_info=True)
-            return 0
-
     try:
-        cap = cv2.VideoCapture(video_path)
+        cap = _open_capture(video_path)
     except cv2.error as e:
-        logging.error(f"OpenCV error opening video file {video_path}: {e}", exc_info=True)
-        return 0
+        logging.error("OpenCV error opening video file %s: %s", video_path, e, exc_info=True)
+        return
     except Exception as e:
-        logging.error(f"Unexpected error opening video file {video_path}: {e}", exc_info=True)
-        return 0
+        logging.error("Unexpected error opening video file %s: %s", video_path, e, exc_info=True)
+        return
 
     if not cap.isOpened():
-        logging.error(f"Could not open video file: {video_path}")
-        return 0
+        logging.error("Could not open video file: %s", video_path)
+        return
 
     total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    use_seek = frame_interval >= config.SEEK_MIN_FRAME_INTERVAL
     frame_count = 0
-    saved_frame_count = 0
-    
-    with tqdm(total=total_frames, desc=f"Extracting {os.path.basename(video_path)}", unit="frame", leave=False) as pbar:
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            if frame_count % frame_interval == 0:
-                if rotation_angle != 0:
-                    if rotation_angle == 90:
-                        frame = cv2.rotate(frame, cv2.ROTATE_90_CLOCKWISE)
-                    elif rotation_angle == 180:
-                        frame = cv2.rotate(frame, cv2.ROTATE_180)
-                    elif rotation_angle == 270:
-                        frame = cv2.rotate(frame, cv2.ROTATE_90_COUNTERCLOCKWISE)
-                
-                frame_filename = os.path.join(output_folder, f"frame_{frame_count:04d}.jpg")
-                if not dry_run:
-                    try:
-                        if cv2.imwrite(frame_filename, frame):
-                            saved_frame_count += 1
-                        else:
-                            logging.warning(f"cv2.imwrite reported failure for frame: {frame_filename}")
-                    except Exception as e:
-                        logging.error(f"Exception while writing frame {frame_filename}: {e}", exc_info=True)
+    try:
+        with tqdm(total=total_frames, desc=f"Extracting {os.path.basename(video_path)}", unit="frame", leave=False, disable=not sys.stderr.isatty(), mininterval=0.2) as pbar:
+            while True:
+                if frame_count % frame_interval:
+                    # Skipped frames are only grabbed: decoded, but never converted to BGR or copied out
+                    if not cap.grab():
+                        break
+                    frame_count += 1
+                    pbar.update(1)
+                    continue
+
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                yield frame_count, _rotate(frame, rotation_angle)
+
+                # If the seek is refused, the loop simply grabs its way to the next sampled frame
+                if use_seek and cap.set(cv2.CAP_PROP_POS_FRAMES, frame_count + frame_interval):
+                    frame_count += frame_interval
+                    pbar.update(frame_interval)
                 else:
-                    saved_frame_count += 1 # Assume success in dry run
+                    frame_count += 1
+                    pbar.update(1)
+    finally:
+        cap.release()
+
+def _rotate(image: np.ndarray, rotation_angle: int) -> np.ndarray:
+    """Rotates an image clockwise by a multiple of 90 degrees; other angles leave it unchanged."""
+    if rotation_angle in _ROTATE_CODES:
+        return cv2.rotate(image, _ROTATE_CODES[rotation_angle])
+    return image
+
+def _analyze_frame(frame: np.ndarray, sharpness_threshold: int, pending_rotation: int = 0, make_thumbnail: bool = True) -> Tuple[Optional[np.ndarray], bool, Optional[int]]:
+    """
+    Converts a frame to grayscale and checks its sharpness; sharp frames also get their hash and, if
+    `make_thumbnail` is set, their SSIM thumbnail.
 
-            frame_count += 1
-            pbar.update(1)
+    `pending_rotation` is a rotation the frame will be shown with (via EXIF) but has not had applied. The small
+    analysis arrays are rotated instead, so decisions match those for a pixel-rotated frame. Sharpness and the
+    histogram do not change under quarter turns.
+    """
+    gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    if calculate_sharpness_from_array(gray_frame) < sharpness_threshold:
+        return None, False, None
+    if make_thumbnail:
+        # The hash only orders SSIM checks in this mode, so take it from the thumbnail instead of shrinking the frame twice
+        thumbnail = _rotate(compute_ssim_thumbnail(gray_frame), pending_rotation)
+        return thumbnail, True, compute_dhash_from_array(thumbnail)
+    # Shrink to the hash grid as it will be once rotated (transposed for quarter turns), then rotate the tiny result
+    grid_size = (8, 9) if pending_rotation in (90, 270) else (9, 8)
+    hash_grid = _rotate(cv2.resize(gray_frame, grid_size, interpolation=cv2.INTER_AREA), pending_rotation)
+    return None, True, compute_dhash_from_array(hash_grid)
 
-    cap.release()
-    logging.debug(f"Extracted {saved_frame_count} frames from {video_path}")
+def _iter_analyzed_frames(frames: Iterator[Tuple[int, np.ndarray]], sharpness_threshold: int, num_threads: int, pending_rotation: int = 0, make_thumbnails: bool = True) -> Iterator[Tuple[int, np.ndarray, Optional[np.ndarray], bool, Optional[int]]]:
+    """
+    Runs `_analyze_frame` over decoded frames, spread across threads, yielding results in frame order.
+
+    OpenCV releases the GIL, so the analysis of several frames can overlap with each other and with decoding.
+    At most two frames per thread are held in flight, and the thread count is capped at
+    `config.MAX_ANALYSIS_THREADS`, so memory use stays bounded however many cores are available.
+    """
+    num_threads = min(num_threads, config.MAX_ANALYSIS_THREADS)
+    if num_threads <= 1:
+        for frame_index, frame in frames:
+            yield (frame_index, frame) + _analyze_frame(frame, sharpness_threshold, pending_rotation, make_thumbnails)
+        return
+
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        pending: deque = deque()
+        for frame_index, frame in frames:
+            pending.append((frame_index, frame, executor.submit(_analyze_frame, frame, sharpness_threshold, pending_rotation, make_thumbnails)))
+            if len(pending) >= 2 * num_threads:
+                frame_index, frame, future = pending.popleft()
+                yield (frame_index, frame) + future.result()
+        while pending:
+            frame_index, frame, future = pending.popleft()
+            yield (frame_index, frame) + future.result()
+
+def _split_rotation(rotation_angle: int, exif_rotation: bool, output_format: str) -> Tuple[int, Optional[bytes]]:
+    """Returns the angle to rotate pixels by and the EXIF segment to write instead, if rotation goes into EXIF (JPEG only)."""
+    if exif_rotation and output_format == "jpg" and rotation_angle in config.EXIF_ORIENTATIONS:
+        return 0, _exif_orientation_segment(rotation_angle)
+    return rotation_angle, None
+
+def _write_params(output_format: str, jpeg_quality: int) -> List[int]:
+    """Returns the OpenCV encoder parameters for the chosen output format."""
+    if output_format == "jpg":
+        return [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality]
+    return [] # PPM is written as raw binary pixels; there is nothing to tune
+
+def extract_frames(video_path: str, output_folder: str, frame_interval: int = 1, rotation_angle: int = 0, dry_run: bool = False, create_output_folder: bool = True, exif_rotation: bool = False, output_format: str = config.DEFAULT_OUTPUT_FORMAT, jpeg_quality: int = config.DEFAULT_JPEG_QUALITY) -> int:
+    """
+    Extracts frames from a video file and saves them as images, without any filtering.
+
+    Args:
+        video_path (str): The path to the video file.
+        output_folder (str): The path to the output directory.
+        frame_interval (int, optional): The interval at which to extract frames. Defaults to 1 (every frame).
+        rotation_angle (int, optional): The angle to rotate the frames. Defaults to 0.
+        dry_run (bool, optional): If True, simulates the process without saving files. Defaults to False.
+        create_output_folder (bool, optional): If False, the caller has already created the output folder. Defaults to True.
+        exif_rotation (bool, optional): If True, record the rotation as EXIF orientation instead of rotating pixels. Defaults to False.
+        output_format (str, optional): The image format, "jpg" or "ppm" (uncompressed, much faster to write). Defaults to "jpg".
+        jpeg_quality (int, optional): The JPEG quality, 0-100. Defaults to 95.
+
+    Returns:
+        int: The number of frames that were actually saved.
+    """
+    if not dry_run and create_output_folder and not _create_output_folder(output_folder):
+        return 0
+
+    rotation_angle, exif_segment = _split_rotation(rotation_angle, exif_rotation, output_format)
+    write_params = _write_params(output_format, jpeg_quality)
+
+    saved_frame_count = 0
+    with ThreadPoolExecutor(max_workers=config.FRAME_WRITER_THREADS) as writer:
+        pending_writes: deque = deque()
+        for frame_index, frame in iter_frames(video_path, frame_interval=frame_interval, rotation_angle=rotation_angle):
+            if dry_run:
+                saved_frame_count += 1 # Assume success in dry run
+                continue
+            pending_writes.append(writer.submit(_write_frame, os.path.join(output_folder, f"frame_{frame_index:04d}.{output_format}"), frame, exif_segment, write_params))
+            saved_frame_count += _drain_writes(pending_writes, config.MAX_PENDING_FRAME_WRITES)
+        saved_frame_count += _drain_writes(pending_writes, 0)
+
+    logging.debug("Extracted %d frames from %s", saved_frame_count, video_path)
     return saved_frame_count
 
-def process_video_frames(video_path: str, output_folder: str, sharpness_threshold: int = 100, duplicate_threshold: float = 1.0, rotation_angle: int = 0, dry_run: bool = False, frame_interval: int = 1) -> Dict[str, Any]:
+def process_video_frames(video_path: str, output_folder: str, sharpness_threshold: int = 100, duplicate_threshold: float = 1.0, rotation_angle: int = 0, dry_run: bool = False, frame_interval: int = 1, create_output_folder: bool = True, num_threads: int = 1, duplicate_method: str = config.DEFAULT_DUPLICATE_METHOD, exif_rotation: bool = False, duplicate_lookback: int = config.DUPLICATE_LOOKBACK_FRAMES, output_format: str = config.DEFAULT_OUTPUT_FORMAT, jpeg_quality: int = config.DEFAULT_JPEG_QUALITY) -> Dict[str, Any]:
     """
     Extracts, cleans, and processes frames from a single video.
 
+    Frames are analysed in memory as they are decoded, and only those that are neither blurry
+    nor duplicates of a recently kept frame are written to disk.
+
     Args:
         video_path (str): The path to the video file.
         output_folder (str): The directory for the output frames.
         sharpness_threshold (int, optional): The sharpness threshold for blur detection. Defaults to 100.
         duplicate_threshold (float, optional): The threshold for duplicate detection. Higher values (closer to 1.0) are more strict, meaning frames must be nearly identical to be considered duplicates. Defaults to 1.0.
         rotation_angle (int, optional): The angle to rotate the frames. Defaults to 0.
-        dry_run (bool, optional): If True, simulates the process without saving files. Defaults to False.
+        dry_run (bool, optional): If True, runs the full analysis without saving files. Defaults to False.
         frame_interval (int, optional): The interval at which to extract frames. Defaults to 1 (every frame).
+        create_output_folder (bool, optional): If False, the caller has already created the output folder. Defaults to True.
+        num_threads (int, optional): The number of threads used to analyse frames, capped at `config.MAX_ANALYSIS_THREADS`. Defaults to 1.
+        duplicate_method (str, optional): "ssim" to compare frames with SSIM, or "hash" to decide on the dHash distance alone. Defaults to "ssim".
+        exif_rotation (bool, optional): If True, record the rotation as EXIF orientation instead of rotating pixels. Duplicate checks look at the frames as they will be displayed. Defaults to False.
+        duplicate_lookback (int, optional): How many of the most recently kept frames each frame is compared against. Defaults to 16.
+        output_format (str, optional): The image format, "jpg" or "ppm" (uncompressed, much faster to write). Defaults to "jpg".
+        jpeg_quality (int, optional): The JPEG quality, 0-100. Defaults to 95.
 
     Returns:
         dict: A summary of the processing results.
     """
-    initial_frame_count = extract_frames(video_path, output_folder, rotation_angle=rotation_angle, dry_run=dry_run, frame_interval=frame_interval)
-
-    if initial_frame_count == 0:
-        return {
-            "video": os.path.basename(video_path),
-            "extracted_frames": 0,
-            "blurry_frames_removed": 0,
-            "duplicate_frames_removed": 0,
-            "final_frames_count": 0,
-            "output_folder": output_folder
-        }
-
-    # Process blurriness
-    frame_files = []
-    try:
-        if not dry_run:
-            frame_files = [os.path.join(output_folder, f) for f in os.listdir(output_folder) if f.endswith(".jpg")]
-    except OSError as e:
-        logging.error(f"Error listing files in {output_folder} for blurriness check: {e}", exc_info=True)
-        return {
-            "video": os.path.basename(video_path),
-            "extracted_frames": initial_frame_count,
-            "blurry_frames_removed": 0,
-            "duplicate_frames_removed": 0,
-            "final_frames_count": initial_frame_count,
-            "output_folder": output_folder,
-            "error": "Failed to list files for blurriness check"
-        }
-
-    blurry_frames_removed = 0
-    if not dry_run:
-        for frame_file in frame_files:
-            sharpness = calculate_sharpness(frame_file)
-            if sharpness < sharpness_threshold:
-                try:
-                    os.remove(frame_file)
-                    blurry_frames_removed += 1
-                    logging.debug(f"Removed blurry frame: {frame_file}")
-                except OSError as e:
-                    logging.error(f"Error removing blurry frame {frame_file}: {e}", exc_info=True)
-
-    # Process duplicates
-    remaining_frames = []
-    try:
-        if not dry_run:
-            remaining_frames = [os.path.join(output_folder, f) for f in os.listdir(output_folder) if f.endswith(".jpg")]
-            remaining_frames.sort()
-    except OSError as e:
-        logging.error(f"Error listing files in {output_folder} for duplicate check: {e}", exc_info=True)
-        return {
-            "video": os.path.basename(video_path),
-            "extracted_frames": initial_frame_count,
-            "blurry_frames_removed": blurry_frames_removed,
-            "duplicate_frames_removed": 0,
-            "final_frames_count": initial_frame_count - blurry_frames_removed,
-            "output_folder": output_folder,
-            "error": "Failed to list files for duplicate check"
-        }
-    
-    duplicates_removed = 0
-    if not dry_run and len(remaining_frames) > 1:
-        to_remove = set()
-        for i in range(len(remaining_frames)):
-            for j in range(i + 1, len(remaining_frames)):
-                if remaining_frames[j] in to_remove:
-                    continue
-                if are_images_duplicates(remaining_frames[i], remaining_frames[j], duplicate_threshold=duplicate_threshold):
-                    to_remove.add(remaining_frames[j])
-
-        for frame_to_remove in to_remove:
-            try:
-                os.remove(frame_to_remove)
-                logging.debug(f"Removed duplicate frame: {frame_to_remove}")
-            except OSError as e:
-                logging.error(f"Error removing duplicate frame {frame_to_remove}: {e}", exc_info=True)
-        duplicates_removed = len(to_remove)
-
-    final_frames_count = 0
-    if not dry_run:
-        try:
-            final_frames_count = len([f for f in os.listdir(output_folder) if f.endswith(".jpg")])
-        except OSError as e:
-            logging.error(f"Could not count final frames in {output_folder}: {e}", exc_info=True)
-    else:
-        final_frames_count = initial_frame_count - blurry_frames_removed - duplicates_removed
-
-
-    return {
+    summary = {
         "video": os.path.basename(video_path),
-        "extracted_frames": initial_frame_count,
-        "blurry_frames_removed": blurry_frames_removed,
-        "duplicate_frames_removed": duplicates_removed,
-        "final_frames_count": final_frames_count,
+        "extracted_frames": 0,
+        "blurry_frames_removed": 0,
+        "duplicate_frames_removed": 0,
+        "final_frames_count": 0,
         "output_folder": output_folder
     }
+    if not dry_run and create_output_folder and not _create_output_folder(output_folder):
+        return summary
+
+    pixel_rotation, exif_segment = _split_rotation(rotation_angle, exif_rotation, output_format)
+    pending_rotation = rotation_angle - pixel_rotation
+    write_params = _write_params(output_format, jpeg_quality)
+    max_distance = _max_hash_distance(duplicate_threshold)
+    verify_with_ssim = duplicate_method == "ssim"
+    # Video frames mostly duplicate their neighbours, so each frame is only compared with the last few kept frames
+    # These live in fixed-size ring buffers (slot = kept count % lookback), keeping time and memory per frame bounded
+    kept_hashes = np.zeros(duplicate_lookback, dtype=np.uint64)
+    kept_thumbnails: List[Optional[np.ndarray]] = [None] * duplicate_lookback
+    kept_histograms: List[Optional[np.ndarray]] = [None] * duplicate_lookback
+    kept_count = 0
+
+    with ThreadPoolExecutor(max_workers=config.FRAME_WRITER_THREADS) as writer:
+        pending_writes: deque = deque()
+        frames = iter_frames(video_path, frame_interval=frame_interval, rotation_angle=pixel_rotation)
+        for frame_index, frame, thumbnail, is_sharp, frame_hash in _iter_analyzed_frames(frames, sharpness_threshold, num_threads, pending_rotation, verify_with_ssim):
+            summary["extracted_frames"] += 1
+
+            if not is_sharp:
+                summary["blurry_frames_removed"] += 1
+                logging.debug("Skipped blurry frame %d of %s", frame_index, video_path)
+                continue
+
+            is_duplicate = False
+            histogram = None
+            if kept_count:
+                distances = hamming_distances(kept_hashes[:min(kept_count, duplicate_lookback)], frame_hash)
+                if not verify_with_ssim:
+                    is_duplicate = bool((distances <= max_distance).any())
+                else:
+                    # dHash bits flip freely on flat, grainy footage, so the hash never rules a pair out here;
+                    # it only orders the SSIM checks so a duplicate is usually found on the first comparison
+                    histogram = compute_histogram_from_array(thumbnail)
+                    is_duplicate = any(
+                        are_arrays_duplicates(kept_thumbnails[i], thumbnail, duplicate_threshold=duplicate_threshold, histogram1=kept_histograms[i], histogram2=histogram)
+                        for i in np.argsort(distances, kind="stable")
+                    )
+
+            if is_duplicate:
+                summary["duplicate_frames_removed"] += 1
+                logging.debug("Skipped duplicate frame %d of %s", frame_index, video_path)
+                continue
+
+            slot = kept_count % duplicate_lookback
+            kept_hashes[slot] = frame_hash
+            if verify_with_ssim:
+                kept_thumbnails[slot] = thumbnail
+                kept_histograms[slot] = histogram if histogram is not None else compute_histogram_from_array(thumbnail)
+            kept_count += 1
+
+            if dry_run:
+                summary["final_frames_count"] += 1
+                continue
+
+            # Encoding and writing happen on writer threads, overlapping with decoding the next frames
+            frame_filename = os.path.join(output_folder, f"frame_{frame_index:04d}.{output_format}")
+            pending_writes.append(writer.submit(_write_frame, frame_filename, frame, exif_segment, write_params))
+            summary["final_frames_count"] += _drain_writes(pending_writes, config.MAX_PENDING_FRAME_WRITES)
+        summary["final_frames_count"] += _drain_writes(pending_writes, 0)
+
+    logging.debug("Kept %d of %d frames from %s", summary["final_frames_count"], summary["extracted_frames"], video_path)
+    return summary
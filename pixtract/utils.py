@@ -2,7 +2,31 @@
 
 import cv2
 import logging
-from skimage.metrics import structural_similarity as ssim
+import numpy as np
+from typing import Optional
+from . import config
+
+# SSIM stabilising constants for 8-bit images, as in Wang et al. and scikit-image
+_SSIM_C1 = (0.01 * 255) ** 2
+_SSIM_C2 = (0.03 * 255) ** 2
+
+# Native popcount ufunc, available from NumPy 2.0
+_bitwise_count = getattr(np, "bitwise_count", None)
+
+def calculate_sharpness_from_array(image: np.ndarray) -> float:
+    """
+    Calculates the sharpness of an already decoded grayscale image using the variance of the Laplacian.
+
+    Args:
+        image (np.ndarray): The grayscale image.
+
+    Returns:
+        float: The sharpness value. A higher value indicates a sharper image.
+    """
+    # The Laplacian of 8-bit input stays within +/-1020, so int16 holds it exactly at a quarter of float64's memory traffic;
+    # meanStdDev then gets the variance in a single pass
+    _, stddev = cv2.meanStdDev(cv2.Laplacian(image, cv2.CV_16S))
+    return float(stddev[0, 0]) ** 2
 
 def calculate_sharpness(image_path: str) -> float:
     """
@@ -19,7 +43,7 @@ def calculate_sharpness(image_path: str) -> float:
         if image is None:
             logging.warning(f"Could not read image for sharpness calculation: {image_path}")
             return 0.0 # Return float for consistency
-        return float(cv2.Laplacian(image, cv2.CV_64F).var()) # Ensure float return
+        return calculate_sharpness_from_array(image)
     except cv2.error as e:
         logging.error(f"OpenCV error calculating sharpness for {image_path}: {e}", exc_info=True)
         return 0.0
@@ -27,6 +51,120 @@ def calculate_sharpness(image_path: str) -> float:
         logging.error(f"Unexpected error calculating sharpness for {image_path}: {e}", exc_info=True)
         return 0.0
 
+def structural_similarity(image1: np.ndarray, image2: np.ndarray, win_size: int = 7) -> float:
+    """
+    Computes the mean structural similarity index (SSIM) of two same-sized grayscale uint8 images.
+
+    This matches scikit-image's `structural_similarity` defaults (uniform window, sample covariance,
+    border pixels excluded), but builds the local statistics with OpenCV's box filter, which is much faster.
+
+    Args:
+        image1 (np.ndarray): The first grayscale image.
+        image2 (np.ndarray): The second grayscale image, with the same shape as the first.
+        win_size (int, optional): The side of the square comparison window; odd. Shrunk for tiny images. Defaults to 7.
+
+    Returns:
+        float: The mean SSIM, where 1.0 means identical.
+    """
+    win_size = min(win_size, *image1.shape[:2])
+    if win_size % 2 == 0:
+        win_size -= 1
+    if win_size < 3:
+        return 1.0 if np.array_equal(image1, image2) else 0.0
+
+    x = image1.astype(np.float32)
+    y = image2.astype(np.float32)
+
+    def local_mean(values: np.ndarray) -> np.ndarray:
+        return cv2.boxFilter(values, -1, (win_size, win_size), borderType=cv2.BORDER_REFLECT)
+
+    mean_x, mean_y = local_mean(x), local_mean(y)
+    # Sample (rather than population) covariance, as scikit-image uses by default
+    covariance_norm = win_size * win_size / (win_size * win_size - 1.0)
+    var_x = covariance_norm * (local_mean(x * x) - mean_x * mean_x)
+    var_y = covariance_norm * (local_mean(y * y) - mean_y * mean_y)
+    cov_xy = covariance_norm * (local_mean(x * y) - mean_x * mean_y)
+
+    ssim_map = ((2 * mean_x * mean_y + _SSIM_C1) * (2 * cov_xy + _SSIM_C2)) / (
+        (mean_x * mean_x + mean_y * mean_y + _SSIM_C1) * (var_x + var_y + _SSIM_C2)
+    )
+    # Only windows that lie entirely inside the image count towards the mean
+    pad = (win_size - 1) // 2
+    return float(ssim_map[pad:-pad, pad:-pad].mean(dtype=np.float64))
+
+def compute_histogram_from_array(image: np.ndarray) -> np.ndarray:
+    """
+    Computes the coarse cumulative grayscale histogram used to rule out duplicates before running SSIM.
+
+    Args:
+        image (np.ndarray): The grayscale image.
+
+    Returns:
+        np.ndarray: The cumulative fraction of pixels up to each of the `config.HISTOGRAM_BINS` bins.
+    """
+    histogram = cv2.calcHist([image], [0], None, [config.HISTOGRAM_BINS], [0, 256]).ravel()
+    return np.cumsum(histogram) / image.size
+
+def histogram_shift(histogram1: np.ndarray, histogram2: np.ndarray) -> float:
+    """
+    Estimates how many gray levels, on average, pixels must move to turn one histogram into the other.
+
+    This is the 1-D earth mover's distance between the two cumulative histograms. Unlike bin-by-bin
+    measures, it stays small when a slight brightness change pushes flat areas into a neighbouring bin.
+
+    Args:
+        histogram1 (np.ndarray): A `compute_histogram_from_array` result.
+        histogram2 (np.ndarray): Another `compute_histogram_from_array` result.
+
+    Returns:
+        float: The average shift in gray levels (0-255).
+    """
+    return float(np.abs(histogram1 - histogram2).sum()) * (256 / config.HISTOGRAM_BINS)
+
+def compute_ssim_thumbnail(image: np.ndarray) -> np.ndarray:
+    """
+    Shrinks a grayscale image to the fixed square size that duplicate detection compares with SSIM.
+
+    Args:
+        image (np.ndarray): The grayscale image.
+
+    Returns:
+        np.ndarray: The `config.SSIM_THUMBNAIL_SIZE` square thumbnail, or the image itself if it already is one.
+    """
+    size = config.SSIM_THUMBNAIL_SIZE
+    if image.shape[:2] == (size, size):
+        return image
+    return cv2.resize(image, (size, size), interpolation=cv2.INTER_AREA)
+
+def are_arrays_duplicates(image1: np.ndarray, image2: np.ndarray, duplicate_threshold: float = 1.0, histogram1: Optional[np.ndarray] = None, histogram2: Optional[np.ndarray] = None) -> bool:
+    """
+    Compares two already decoded grayscale images for similarity to determine if they are duplicates.
+
+    Both images are compared as small thumbnails (see `compute_ssim_thumbnail`), and those whose histograms
+    are clearly different are rejected before the comparatively expensive SSIM.
+
+    Args:
+        image1 (np.ndarray): The first grayscale image.
+        image2 (np.ndarray): The second grayscale image.
+        duplicate_threshold (float, optional): The threshold for similarity. Higher values (closer to 1.0) mean images must be nearly identical to be considered duplicates. Defaults to 1.0.
+        histogram1 (np.ndarray, optional): A cached `compute_histogram_from_array` result for the first image's thumbnail.
+        histogram2 (np.ndarray, optional): A cached `compute_histogram_from_array` result for the second image's thumbnail.
+
+    Returns:
+        bool: True if the images are considered duplicates, False otherwise.
+    """
+    image1 = compute_ssim_thumbnail(image1)
+    image2 = compute_ssim_thumbnail(image2)
+    if histogram1 is None:
+        histogram1 = compute_histogram_from_array(image1)
+    if histogram2 is None:
+        histogram2 = compute_histogram_from_array(image2)
+    max_shift = config.MAX_HISTOGRAM_SHIFT + config.HISTOGRAM_SHIFT_SLACK * (1.0 - duplicate_threshold)
+    if histogram_shift(histogram1, histogram2) > max_shift:
+        return False
+
+    return structural_similarity(image1, image2) >= duplicate_threshold
+
 def are_images_duplicates(image_path1: str, image_path2: str, duplicate_threshold: float = 1.0) -> bool:
     """
     Compares two images for similarity to determine if they are duplicates.
@@ -40,8 +178,9 @@ def are_images_duplicates(image_path1: str, image_path2: str, duplicate_threshol
         bool: True if the images are considered duplicates, False otherwise.
     """
     try:
-        image1 = cv2.imread(image_path1)
-        image2 = cv2.imread(image_path2)
+        # Duplicate detection doesn't need full resolution: let the JPEG decoder skip half the IDCT work
+        image1 = cv2.imread(image_path1, cv2.IMREAD_REDUCED_GRAYSCALE_2)
+        image2 = cv2.imread(image_path2, cv2.IMREAD_REDUCED_GRAYSCALE_2)
 
         if image1 is None:
             logging.warning(f"Could not read first image for duplicate comparison: {image_path1}")
@@ -50,20 +189,44 @@ def are_images_duplicates(image_path1: str, image_path2: str, duplicate_threshol
             logging.warning(f"Could not read second image for duplicate comparison: {image_path2}")
             return False
 
-        # Ensure images are of the same size for SSIM calculation
-        # Resize to a common size if they are not already
-        if image1.shape != image2.shape:
-            image1 = cv2.resize(image1, (256, 256))
-            image2 = cv2.resize(image2, (256, 256))
-
-        gray1 = cv2.cvtColor(image1, cv2.COLOR_BGR2GRAY)
-        gray2 = cv2.cvtColor(image2, cv2.COLOR_BGR2GRAY)
-
-        similarity_index, _ = ssim(gray1, gray2, full=True)
-        return similarity_index >= duplicate_threshold
+        return are_arrays_duplicates(image1, image2, duplicate_threshold=duplicate_threshold)
     except cv2.error as e:
         logging.error(f"OpenCV error comparing images {image_path1} and {image_path2}: {e}", exc_info=True)
         return False
     except Exception as e:
         logging.error(f"Unexpected error comparing images {image_path1} and {image_path2}: {e}", exc_info=True)
-        return False
\ No newline at end of file
+        return False
+
+def compute_dhash_from_array(image: np.ndarray) -> int:
+    """
+    Computes a 64-bit difference hash (dHash) of an already decoded grayscale image.
+
+    The image is shrunk to 9x8 and each bit records whether a pixel is brighter than its left neighbour,
+    so the hash captures the coarse gradient structure. On nearly flat images the bits are unstable,
+    since neighbouring cells are almost equal.
+
+    Args:
+        image (np.ndarray): The grayscale image.
+
+    Returns:
+        int: The hash as an unsigned 64-bit integer.
+    """
+    small = cv2.resize(image, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = small[:, 1:] > small[:, :-1]
+    return int(np.packbits(bits).view(">u8")[0])
+
+def hamming_distances(hashes: np.ndarray, reference_hash: np.uint64) -> np.ndarray:
+    """
+    Counts the differing bits between each 64-bit hash in an array and a reference hash.
+
+    Args:
+        hashes (np.ndarray): A 1-D array of uint64 hashes.
+        reference_hash (np.uint64): The hash to compare against.
+
+    Returns:
+        np.ndarray: The Hamming distance (0-64) for each hash.
+    """
+    differing_bits = np.bitwise_xor(hashes, np.uint64(reference_hash))
+    if _bitwise_count is not None:
+        return _bitwise_count(differing_bits)
+    return np.unpackbits(differing_bits.view(np.uint8)).reshape(-1, 64).sum(axis=1)
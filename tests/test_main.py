@@ -0,0 +1,76 @@
+import argparse
+import os
+import time
+from pixtract import main
+from pixtract.main import _validate_all
+
+def _make_args(input_path, output=None, dry_run=False):
+    return argparse.Namespace(input_path=str(input_path), output=output, dry_run=dry_run)
+
+def test_validate_all_accepts_directory(tmp_path):
+    """A writable directory input should validate cleanly and be reported as a directory."""
+    input_is_dir, errors = _validate_all(_make_args(tmp_path))
+    assert input_is_dir
+    assert errors == []
+
+def test_validate_all_reports_every_error(tmp_path):
+    """A missing input and an unusable output should both be reported in one pass."""
+    blocking_file = tmp_path / "not_a_dir"
+    blocking_file.write_text("")
+    _, errors = _validate_all(_make_args(tmp_path / "missing.mp4", output=str(blocking_file / "out")))
+    assert len(errors) == 2
+
+def _crashing_process_single_video(video_file, output_folder, processing_params, num_threads=1):
+    """
+    Stands in for `_process_single_video`: the worker handling `crash_on` dies after `crash_delay` seconds.
+
+    With `crash_once_marker` set, it only dies the first time, as a transient out-of-memory kill would.
+    """
+    if os.path.basename(video_file) == processing_params.get("crash_on"):
+        marker = processing_params.get("crash_once_marker")
+        if marker is None or not os.path.exists(marker):
+            if marker is not None:
+                open(marker, "w").close()
+            time.sleep(processing_params.get("crash_delay", 0))
+            os._exit(1)
+    else:
+        time.sleep(0.05) # Keep the other videos queued behind the crashing one
+    return {
+        "video": video_file,
+        "output_folder": output_folder,
+        "extracted_frames": 2,
+        "blurry_frames_removed": 0,
+        "duplicate_frames_removed": 1,
+        "final_frames_count": 1
+    }
+
+def _run_crashing_batch(tmp_path, monkeypatch, **crash_params):
+    monkeypatch.setattr(main, "_process_single_video", _crashing_process_single_video)
+    names = ["a.mp4", "b.mp4", "c.mp4", "d.mp4", "e.mp4", "f.mp4"]
+    # Sized so that a.mp4 is submitted first and f.mp4 last
+    video_files = [(str(tmp_path / name), len(names) - index) for index, name in enumerate(names)]
+    totals, summaries = main._process_videos(video_files, False, str(tmp_path), {"dry_run": True, **crash_params}, num_workers=2)
+    failed = [os.path.basename(summary["video"]) for summary in summaries if summary.get("status") == "failed"]
+    return totals, failed
+
+def test_process_videos_worker_crash_after_others_finish(tmp_path, monkeypatch):
+    """A worker dying on the last video should fail only that video and keep the other results."""
+    totals, failed = _run_crashing_batch(tmp_path, monkeypatch, crash_on="f.mp4", crash_delay=0.5)
+    assert failed == ["f.mp4"]
+    assert totals["failed_videos"] == 1
+    assert totals["extracted_frames"] == 10
+    assert totals["final_frames_count"] == 5
+
+def test_process_videos_worker_crash_with_videos_queued(tmp_path, monkeypatch):
+    """A worker dying on the first, largest video should not take the queued videos down with it."""
+    totals, failed = _run_crashing_batch(tmp_path, monkeypatch, crash_on="a.mp4")
+    assert failed == ["a.mp4"]
+    assert totals["failed_videos"] == 1
+    assert totals["extracted_frames"] == 10
+
+def test_process_videos_retries_crashed_video_once(tmp_path, monkeypatch):
+    """A video whose worker dies only once should succeed on its retry."""
+    totals, failed = _run_crashing_batch(tmp_path, monkeypatch, crash_on="a.mp4", crash_once_marker=str(tmp_path / "crashed"))
+    assert failed == []
+    assert totals["failed_videos"] == 0
+    assert totals["extracted_frames"] == 12
@@ -2,7 +2,8 @@ import pytest
 import cv2
 import numpy as np
 import os
-from pixtract.processing import process_video_frames
+from pixtract import config
+from pixtract.processing import extract_frames, process_video_frames, _analyze_frame, _exif_orientation_segment, _write_frame
 
 @pytest.fixture
 def robust_dummy_video(tmp_path):
@@ -60,3 +61,134 @@ def test_process_video_frames_with_robust_video(robust_dummy_video, tmp_path):
     final_files = os.listdir(video_output_dir)
     assert len(final_files) == 1
     assert len([f for f in final_files if f.endswith(".jpg")]) == 1
+
+def test_process_video_frames_threaded_matches_sequential(robust_dummy_video, tmp_path):
+    """Analysing frames on several threads should give the same results as a single thread."""
+    params = dict(sharpness_threshold=10, duplicate_threshold=0.99, frame_interval=1, dry_run=True)
+    sequential = process_video_frames(robust_dummy_video, str(tmp_path / "seq"), num_threads=1, **params)
+    threaded = process_video_frames(robust_dummy_video, str(tmp_path / "thr"), num_threads=4, **params)
+    assert threaded == {**sequential, "output_folder": str(tmp_path / "thr")}
+
+def test_process_video_frames_lookback_limits_comparisons(robust_dummy_video, tmp_path):
+    """Frames are only compared with the most recently kept frames, so an old match is no longer found."""
+    params = dict(sharpness_threshold=10, duplicate_threshold=0.99, frame_interval=1, dry_run=True)
+    # Sequence A, B, B, B, B, A, ...: with a lookback of 1 the second A only sees the kept B
+    summary = process_video_frames(robust_dummy_video, str(tmp_path), duplicate_lookback=1, **params)
+    assert summary["final_frames_count"] == 6
+    summary = process_video_frames(robust_dummy_video, str(tmp_path), duplicate_lookback=2, **params)
+    assert summary["final_frames_count"] == 2
+
+def test_process_video_frames_hash_method(robust_dummy_video, tmp_path):
+    """Deciding duplicates on the hash alone should still drop the identical sampled frames."""
+    summary = process_video_frames(
+        robust_dummy_video, str(tmp_path), sharpness_threshold=10, duplicate_threshold=0.99,
+        frame_interval=5, dry_run=True, duplicate_method="hash"
+    )
+    assert summary["duplicate_frames_removed"] == 2
+    assert summary["final_frames_count"] == 1
+
+def test_process_video_frames_exif_rotation(robust_dummy_video, tmp_path):
+    """EXIF rotation should keep the same frames, unrotated on disk, with an orientation tag viewers can apply."""
+    params = dict(sharpness_threshold=10, duplicate_threshold=0.99, frame_interval=5, rotation_angle=90)
+    rotated = process_video_frames(robust_dummy_video, str(tmp_path / "rot"), **params)
+    tagged = process_video_frames(robust_dummy_video, str(tmp_path / "exif"), exif_rotation=True, **params)
+    assert tagged == {**rotated, "output_folder": str(tmp_path / "exif")}
+
+    assert len(os.listdir(tmp_path / "exif")) == 1
+
+@pytest.fixture
+def asymmetric_dummy_video(tmp_path):
+    """Create a non-square video of smooth random frames that drift slightly, so nothing is rotation-symmetric."""
+    video_path = tmp_path / "asymmetric.mp4"
+    out = cv2.VideoWriter(str(video_path), cv2.VideoWriter_fourcc(*'mp4v'), 5, (96, 64))
+    rng = np.random.default_rng(0)
+    base = cv2.GaussianBlur((rng.random((64, 96, 3)) * 255).astype(np.uint8), (0, 0), 4)
+    for _ in range(24):
+        if rng.random() < 0.3:
+            base = cv2.GaussianBlur((rng.random((64, 96, 3)) * 255).astype(np.uint8), (0, 0), 4)
+        drift = cv2.GaussianBlur(rng.normal(0, 12, (64, 96, 3)), (0, 0), 6)
+        out.write(np.clip(base + drift, 0, 255).astype(np.uint8))
+    out.release()
+    return str(video_path)
+
+@pytest.mark.parametrize("rotation_angle", [90, 180, 270])
+def test_analyze_frame_pending_rotation_matches_rotated_frame(rotation_angle):
+    """Analysing an unrotated frame with a pending rotation should match analysing the rotated frame."""
+    rng = np.random.default_rng(rotation_angle)
+    frame = cv2.GaussianBlur((rng.random((60, 100, 3)) * 255).astype(np.uint8), (0, 0), 5)
+    rotated = cv2.rotate(frame, {90: cv2.ROTATE_90_CLOCKWISE, 180: cv2.ROTATE_180, 270: cv2.ROTATE_90_COUNTERCLOCKWISE}[rotation_angle])
+    # The hash decides duplicates when no thumbnail is made, so it must match exactly
+    _, is_sharp, frame_hash = _analyze_frame(frame, 0, pending_rotation=rotation_angle, make_thumbnail=False)
+    assert is_sharp
+    assert frame_hash == _analyze_frame(rotated, 0, make_thumbnail=False)[2]
+    # SSIM thumbnails may differ by rounding
+    thumbnail, _, _ = _analyze_frame(frame, 0, pending_rotation=rotation_angle)
+    expected_thumbnail, _, _ = _analyze_frame(rotated, 0)
+    assert np.abs(thumbnail.astype(int) - expected_thumbnail).max() <= 1
+
+@pytest.mark.parametrize("duplicate_method", ["hash", "ssim"])
+def test_process_video_frames_exif_rotation_matches_pixel_rotation(asymmetric_dummy_video, tmp_path, duplicate_method):
+    """Duplicate decisions should not depend on whether a quarter-turn is applied to pixels or written to EXIF."""
+    params = dict(sharpness_threshold=0, duplicate_threshold=0.9, rotation_angle=90, dry_run=True, duplicate_method=duplicate_method)
+    rotated = process_video_frames(asymmetric_dummy_video, str(tmp_path), **params)
+    tagged = process_video_frames(asymmetric_dummy_video, str(tmp_path), exif_rotation=True, **params)
+    assert 0 < rotated["duplicate_frames_removed"] < rotated["extracted_frames"] - 1
+    assert tagged == rotated
+
+def test_write_frame_with_exif_orientation(tmp_path):
+    """Frames written with an orientation segment should load rotated in EXIF-aware readers."""
+    frame = np.zeros((10, 30, 3), dtype=np.uint8)
+    frame[:, :10] = 255
+    frame_path = str(tmp_path / "frame.jpg")
+    assert _write_frame(frame_path, frame, _exif_orientation_segment(90))
+
+    assert cv2.imread(frame_path, cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION).shape == (10, 30, 3)
+    oriented = cv2.imread(frame_path)
+    assert oriented.shape == (30, 10, 3)
+    # The bright left edge ends up on top after a clockwise turn
+    assert oriented[:10].mean() > 200 and oriented[20:].mean() < 50
+
+def test_process_video_frames_seeking_matches_decoding(robust_dummy_video, tmp_path, monkeypatch):
+    """Seeking to sampled frames should select the same frames as decoding straight through."""
+    params = dict(sharpness_threshold=10, duplicate_threshold=0.99, frame_interval=5, dry_run=True)
+    expected = process_video_frames(robust_dummy_video, str(tmp_path), **params)
+    monkeypatch.setattr(config, "SEEK_MIN_FRAME_INTERVAL", 1)
+    assert process_video_frames(robust_dummy_video, str(tmp_path), **params) == expected
+
+def test_process_video_frames_ppm_output(robust_dummy_video, tmp_path):
+    """Frames should be written in the requested format with a matching extension."""
+    output_dir = tmp_path / "ppm"
+    summary = process_video_frames(
+        robust_dummy_video, str(output_dir), sharpness_threshold=10, duplicate_threshold=0.99,
+        frame_interval=5, output_format="ppm"
+    )
+    (frame_file,) = os.listdir(output_dir)
+    assert summary["final_frames_count"] == 1
+    assert frame_file.endswith(".ppm")
+    assert cv2.imread(str(output_dir / frame_file)).shape == (20, 20, 3)
+
+def test_process_video_frames_low_texture_duplicates(tmp_path):
+    """Grainy, nearly flat frames are SSIM duplicates even though their difference hashes disagree."""
+    video_path = str(tmp_path / "low_texture.mp4")
+    out = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'mp4v'), 5, (640, 360))
+    rng = np.random.default_rng(0)
+    gradient = np.tile(np.linspace(120, 123, 640), (360, 1))
+    # A shallow gradient with fresh grain and a slight brightness drift in every frame
+    for k in range(4):
+        frame = np.clip(gradient + 0.5 * k + rng.normal(0, 6, gradient.shape), 0, 255).astype(np.uint8)
+        out.write(cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR))
+    out.release()
+
+    summary = process_video_frames(video_path, str(tmp_path / "out"), duplicate_threshold=0.9, dry_run=True)
+    assert summary["extracted_frames"] == 4
+    assert summary["duplicate_frames_removed"] == 3
+
+def test_extract_frames_saves_every_interval_frame(robust_dummy_video, tmp_path):
+    """extract_frames keeps every sampled frame, duplicates included, and returns how many it saved."""
+    output_dir = tmp_path / "frames"
+    assert extract_frames(robust_dummy_video, str(output_dir), frame_interval=5, dry_run=True) == 3
+    assert not output_dir.exists()
+
+    saved_count = extract_frames(robust_dummy_video, str(output_dir), frame_interval=5)
+    assert saved_count == 3
+    assert sorted(os.listdir(output_dir)) == ["frame_0000.jpg", "frame_0005.jpg", "frame_0010.jpg"]
@@ -1,7 +1,7 @@
 import pytest
 import numpy as np
 import cv2
-from pixtract.utils import calculate_sharpness, are_images_duplicates
+from pixtract.utils import calculate_sharpness, are_images_duplicates, compute_dhash_from_array, hamming_distances, structural_similarity, compute_histogram_from_array, histogram_shift
 
 @pytest.fixture
 def dummy_images(tmp_path):
@@ -32,3 +32,32 @@ def test_are_images_duplicates(dummy_images):
     assert are_images_duplicates(black_image_path, black_image_path)
     # A black image should not be a duplicate of a white image
     assert not are_images_duplicates(black_image_path, white_image_path)
+
+def test_compute_dhash_and_hamming_distances():
+    """Identical images should hash identically, gradients set the expected bits, and distances should count differing bits."""
+    image = np.tile(np.arange(0, 256, 8, dtype=np.uint8), (32, 1))
+    image_hash = compute_dhash_from_array(image)
+    assert image_hash == compute_dhash_from_array(image.copy())
+    # Brightness rises left to right everywhere, so every bit is set; mirrored, none is
+    assert image_hash == 2**64 - 1
+    assert compute_dhash_from_array(image[:, ::-1]) == 0
+
+    hashes = np.array([image_hash, image_hash ^ 0b1011], dtype=np.uint64)
+    assert list(hamming_distances(hashes, np.uint64(image_hash))) == [0, 3]
+
+def test_structural_similarity():
+    """SSIM should be 1.0 for identical images and drop for a blurred copy."""
+    rng = np.random.default_rng(0)
+    image = (rng.random((48, 64)) * 255).astype(np.uint8)
+    blurred = cv2.GaussianBlur(image, (5, 5), 1)
+    assert structural_similarity(image, image) == pytest.approx(1.0)
+    assert structural_similarity(image, blurred) < 0.5
+
+def test_histogram_shift():
+    """A slight brightness change should count as a small shift, a large one as a large shift."""
+    image = np.full((32, 32), 95, dtype=np.uint8)
+    image[8:24, 8:24] = 200
+    assert histogram_shift(compute_histogram_from_array(image), compute_histogram_from_array(image)) == 0.0
+    # 95 -> 97 crosses a bin boundary, but the shift stays small
+    assert histogram_shift(compute_histogram_from_array(image), compute_histogram_from_array(image + 2)) < 10
+    assert histogram_shift(compute_histogram_from_array(image), compute_histogram_from_array(image // 4)) > 50